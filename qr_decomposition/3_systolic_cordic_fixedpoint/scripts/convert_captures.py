@@ -0,0 +1,33 @@
+"""
+One-off converter that rewrites the text capture files in the results folder
+into binary .npy files holding the integer A,Q and R matrices stacked as an
+int64 array of shape (num_arrays, 3, k, k).
+
+error_checker.runErrorChecker automatically prefers the .npy file when one
+exists next to the capture, so converted captures are loaded with a memory
+mapped read in microseconds instead of re-tokenising the text on every run.
+The fixed point interpretation is applied at load time, so one converted
+capture serves every value of n.
+"""
+import argparse
+import os
+import numpy as np
+import error_checker
+
+# Program to be run if this script is executed.
+if(__name__ == "__main__"):
+   # Process command Line arguments
+   parser = argparse.ArgumentParser(
+                     prog='Capture File Converter for QRD Systolic Array program',
+                     description='A program that converts the text capture files produced by the actor network into binary .npy files for fast repeated loading'
+            )
+   parser.add_argument('-d', '--results_directory', type=str, default="results/", help="Directory containing the capture_*.txt files to convert")
+   args = parser.parse_args()
+
+   capture_file_names = [f for f in os.listdir(args.results_directory) if f.startswith("capture_") and f.endswith(".txt")]
+   for capture_file_name in capture_file_names:
+      capture_path = os.path.join(args.results_directory, capture_file_name)
+      A_matrices, Q_matrices, R_matrices = error_checker._parse_capture(capture_path)
+      stacked = np.stack((A_matrices, Q_matrices, R_matrices), axis=1)
+      np.save(os.path.splitext(capture_path)[0] + ".npy", stacked)
+      print(f"Converted {capture_path}: {stacked.shape[0]} decompositions of size {stacked.shape[2]}x{stacked.shape[3]}")
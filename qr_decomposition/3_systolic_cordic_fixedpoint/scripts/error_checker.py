@@ -8,10 +8,109 @@ for the A,Q and R matrices and interprets them as real values. It then
 multiplies Q and R together to calculate A again. From this it determines
 the error between the original A and the recalculated A.
 """
+import collections
+import functools
+import os
+import re
 import numpy as np
 import pandas as pd
 import argparse
-from typing import Tuple
+from typing import List, Tuple
+
+# Numba is optional. When it is available the near-zero clamp and error
+# reductions run as a single fused compiled kernel instead of a chain of
+# numpy operations that each make a pass over the full batch.
+try:
+   from numba import njit, prange
+except ImportError:
+   njit = None
+
+# Matches a single row of a captured matrix, e.g. "A3: row 0: 12 -34 5 ".
+# Group 1 is the matrix name (A, Q or R), group 2 the decomposition index
+# and group 3 the row of integer elements.
+capture_line_pattern = re.compile(r"^([AQR])(\d+):\s*row\s*\d+:\s*(.*?)\s*$")
+
+if njit is not None:
+   @njit(parallel=True, fastmath=True, cache=True)
+   def _clamped_error_reduction(A, A_reconstructed):
+      """
+      Fused near-zero clamp plus max/RMS error reduction over a batch of
+      matrices. Computes, per decomposition, the same values as the numpy
+      fallback in runErrorChecker but in a single pass with no temporaries.
+      """
+      num_arrays, rows, cols = A.shape
+      highest_errors = np.empty(num_arrays, dtype=np.float64)
+      mean_errors = np.empty(num_arrays, dtype=np.float64)
+      for b in prange(num_arrays):
+         magnitude = 0.0
+         for r in range(rows):
+            for c in range(cols):
+               magnitude += abs(A_reconstructed[b, r, c])
+         near0 = magnitude / (rows * cols) / 10
+
+         highest = 0.0
+         square_sum = 0.0
+         for r in range(rows):
+            for c in range(cols):
+               reconstructed = A_reconstructed[b, r, c]
+               if abs(reconstructed) < near0:
+                  reconstructed = near0
+               original = A[b, r, c]
+               if abs(original) < near0:
+                  original = near0
+               error = abs(original - reconstructed)
+               if error > highest:
+                  highest = error
+               square_sum += error * error
+         highest_errors[b] = highest
+         mean_errors[b] = np.sqrt(square_sum / (rows * cols))
+      return highest_errors, mean_errors
+
+
+@functools.lru_cache(maxsize=1)
+def _parse_capture(input_file_name: str) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+   """
+   Read a capture file and return the (A, Q, R) integer matrices for every
+   decomposition it contains.
+
+   The result only depends on the file itself, not on the fixed point format,
+   so back to back calls on the same capture reuse the parse. The cache is
+   capped at one entry: the csv sweeps read a different file per grid cell
+   because n is baked into the file name, and an unbounded cache would pin
+   every parsed capture in worker memory for the life of the pool.
+
+   :param input_file_name:str name of the capture file to parse.
+   :return: An (A, Q, R) tuple of int64 numpy arrays of shape
+            (num_arrays, k, k) with one slice per decomposition.
+   """
+   # 1. Prefer the binary form of the capture written by convert_captures.py
+   # when one exists. It holds the same integer matrices stacked as
+   # (num_arrays, 3, k, k) and loads as a memory map with no text parsing.
+   npy_file_name = os.path.splitext(input_file_name)[0] + ".npy"
+   if os.path.exists(npy_file_name):
+      stacked = np.load(npy_file_name, mmap_mode='r')
+      return stacked[:, 0], stacked[:, 1], stacked[:, 2]
+
+   # 2. Otherwise read and tokenise the text capture.
+   with open(input_file_name, 'r') as file:
+      content = file.readlines()
+
+   # Group the rows of each matrix by matrix name and decomposition index in a
+   # single pass over the file instead of rescanning the whole file for every index.
+   matrix_rows = collections.defaultdict(list)
+   for line in content:
+      match = capture_line_pattern.match(line)
+      if match:
+         matrix_rows[(match.group(1), int(match.group(2)))].append(match.group(3).split())
+
+   # A capture without any matrix rows parses to empty stacks, so the empty
+   # capture guard in runErrorChecker fires instead of max() raising here.
+   num_arrays = max((index for _, index in matrix_rows), default=-1) + 1
+   if num_arrays == 0:
+      empty = np.empty((0, 0, 0), dtype=np.int64)
+      return empty, empty, empty
+   return tuple(np.stack([np.array(matrix_rows[(name, i)], dtype=np.int64)
+                          for i in range(0, num_arrays)]) for name in ("A", "Q", "R"))
 
 
 def runErrorChecker(m: int = 3, n:int = 19, input_file_name:str="results/capture_k4_Q3p19.txt", suppress:bool=False) -> Tuple[float,float]:
@@ -29,84 +128,85 @@ def runErrorChecker(m: int = 3, n:int = 19, input_file_name:str="results/capture
    :return:(float, float). A tuple containing first, the worst error value among all the arrays
                            and second, the RMS error value among the arrays.
    """
-   # 1. Read data from file
-   with open(input_file_name, 'r') as file:
-      content = file.readlines()
-
+   # 1. Read the integer A,Q and R matrices from the file (cached across calls
+   # with the same file). The matrices are stacked along the first axis with one
+   # slice per decomposition.
+   A_matrices_int, Q_matrices_int, R_matrices_int = _parse_capture(input_file_name)
 
    # The actor network can perform QR decomposition many times. We need to verify
    # that each of these produces relatively small errors
-   num_arrays = int(content[-1][1:content[-1].find(":")]) + 1
-   highest_errors = []
-   mean_errors = []
-
-   for i in range(0,num_arrays):
-
-      # 2. Get the A,Q and R matrices from the read data, convert them from integers
-      # to floating point numpy arrays.
-
-      # 2.1 Get A matrix
-      A_matrix_string = [x[x.rfind(":")+2:-2].split() for x in content if x[0:x.find(":")] == f"A{i}"]
-      A_matrix_fp = [[int(x)*(2**-n) for x in line] for line in A_matrix_string]
-      A_matrix_fp_np = np.array(A_matrix_fp)
-
-      # 2.2 Get the R matrix
-      R_matrix_string = [x[x.rfind(":")+2:-2].split() for x in content if x[0:x.find(":")] == f"R{i}"]
-      R_matrix_fp = [[int(x)*(2**-n) for x in line] for line in R_matrix_string]
-      R_matrix_fp_np = np.array(R_matrix_fp)
-
-      # 2.3 Get the Q matrix
-      Q_matrix_string = [x[x.rfind(":")+2:-2].split() for x in content if x[0:x.find(":")] == f"Q{i}"]
-      Q_matrix_fp = [[int(x)*(2**-n) for x in line] for line in Q_matrix_string]
-      Q_matrix_fp_np = np.array(Q_matrix_fp)
-
-      # 3. Multiply the Q and R matrix together to reconstruct the A matrix
-      A_reconstructed = np.matmul(Q_matrix_fp_np, R_matrix_fp_np)
-
-      near0 = np.mean(np.abs(A_reconstructed))/10
-      A_reconstructed[np.abs(A_reconstructed) < near0] = near0
-      A_matrix_fp_np[np.abs(A_matrix_fp_np) < near0] = near0
-
-      # 4. Determine the error between the source A matrix and the reconstructed one
-      # Determine the error between the different elements
-      errors = np.abs(A_matrix_fp_np - A_reconstructed)
-      highest_error= np.max(errors)
-      mean_error= np.sqrt(np.mean(np.square(errors)))
-
-      # 5. Print all arrays and errors. Only print the highest error value if the
-      # suppress flag is set
-      if(not suppress):
+   num_arrays = len(A_matrices_int)
+   if(num_arrays == 0):
+      return 0.0, 0.0
+
+   # 2. Convert the A,Q and R matrices from integers to floating point numpy
+   # arrays. np.ldexp scales by 2^-n through direct exponent manipulation, so
+   # no 2^-n constant is built and no mantissa rounding occurs, keeping the
+   # conversion bit exact. The computation must stay in double precision:
+   # the accuracy sweep measures errors around 2^-n for n up to 28, which is
+   # below the rounding noise of single precision arithmetic.
+   A_matrices_fp = np.ldexp(A_matrices_int.astype(np.float64), -n)
+   Q_matrices_fp = np.ldexp(Q_matrices_int.astype(np.float64), -n)
+   R_matrices_fp = np.ldexp(R_matrices_int.astype(np.float64), -n)
+
+   # 3. Multiply the Q and R matrices together to reconstruct the A matrices.
+   # A single batched matmul over all decompositions amortises the per-call
+   # numpy dispatch overhead of num_arrays small matrix multiplies.
+   A_reconstructed = np.matmul(Q_matrices_fp, R_matrices_fp)
+
+   # 4. Determine the error between the source A matrices and the reconstructed
+   # ones. With numba available (and no per-matrix printing needed) the clamp
+   # and reductions run as one fused kernel without materialising any
+   # batch-sized temporaries.
+   if njit is not None and suppress:
+      highest_errors, mean_errors = _clamped_error_reduction(A_matrices_fp, A_reconstructed)
+      return np.max(highest_errors),np.mean(mean_errors)
+
+   near0 = np.mean(np.abs(A_reconstructed), axis=(1,2), keepdims=True)/10
+   A_reconstructed = np.where(np.abs(A_reconstructed) < near0, near0, A_reconstructed)
+   A_matrices_fp = np.where(np.abs(A_matrices_fp) < near0, near0, A_matrices_fp)
+
+   # Determine the error between the different elements. Forwarding one buffer
+   # through the subtract and abs ufuncs with out= avoids allocating a fresh
+   # batch-sized temporary per operation.
+   errors = np.empty_like(A_reconstructed)
+   np.subtract(A_matrices_fp, A_reconstructed, out=errors)
+   np.abs(errors, out=errors)
+   highest_errors = np.max(errors, axis=(1,2))
+   mean_errors = np.sqrt(np.mean(np.square(errors), axis=(1,2)))
+
+   # 5. Print all arrays and errors. Only print the highest error value if the
+   # suppress flag is set
+   if(not suppress):
+      for i in range(0,num_arrays):
          print(f"R{i} matrix:")
-         print(pd.DataFrame(R_matrix_fp_np))
+         print(pd.DataFrame(R_matrices_fp[i]))
          print()
 
          print(f"Q{i} matrix: ")
-         print(pd.DataFrame(Q_matrix_fp_np))
+         print(pd.DataFrame(Q_matrices_fp[i]))
          print()
 
          print(f"Original A{i} matrix: ")
-         print(pd.DataFrame(A_matrix_fp_np))
+         print(pd.DataFrame(A_matrices_fp[i]))
          print()
 
          print(f"A{i} matrix constructed by multiplying Q{i} and R{i}: ")
-         print(pd.DataFrame(A_reconstructed))
+         print(pd.DataFrame(A_reconstructed[i]))
          print()
 
          print(f"Error between elements of original A{i} and reconstructed A{i} |a1_ij-a2_ij|")
-         print(pd.DataFrame(errors))
+         print(pd.DataFrame(errors[i]))
          print()
 
          print("Highest error (1 is maximum):")
-         print(highest_error)
+         print(highest_errors[i])
          print()
 
          print("RMS error (1 is maximum):")
-         print(mean_error)
+         print(mean_errors[i])
          print()
 
-      highest_errors.append(highest_error)
-      mean_errors.append(mean_error)
-
    if(not suppress):
       print("Maximum error across all input arrays/Mean error across all input arrays (maximum is 1):")
       print(np.max(highest_errors),np.mean(mean_errors))
@@ -14,102 +14,89 @@ For each experiment the following is captured:
 This results in 4 csv files, 2 for each experiment.
 """
 
+import csv
 import error_checker
 import os
 import time
+from concurrent.futures import ProcessPoolExecutor
 
-# 1. Generate csv files for the first experiment
-# 1.1 Load the names of all the capture files in the results folder where the number of cordic iterations is 12
 directory_string = "results/"
-result_files_names = [f for f in os.listdir(directory_string) if os.path.isfile(os.path.join(directory_string, f)) and "capture_k" in f and "i12" in f]
-
-# 1.2 Get a list of all unique matrix sizes "K" from the list of experiments.
-k_values_not_unique_not_sorted = [int(f[f.find("_")+2:f.find("_",f.find("_")+2)]) for f in result_files_names]
-k_values = list(dict.fromkeys(k_values_not_unique_not_sorted))
-k_values.sort()
-
-# 1.3 Get a list of all unique fractional components "K" from the list of experiments.
-n_values_not_unique_not_sorted = [int(f[f.rfind("p")+1:f.rfind(".")]) for f in result_files_names]
-n_values = list(dict.fromkeys(n_values_not_unique_not_sorted))
-n_values.sort()
-
-# 1.4 Get the m value. Should be the same across files
-m_values_not_unique_not_sorted = [int(f[f.rfind("Q")+1:f.rfind("p")]) for f in result_files_names]
-m = m_values_not_unique_not_sorted[0]
-
-# 1.5 Exract the error values from the different files for the first experiment and store the
-# results in a string
-top_line = "k\\n,"+",".join([str(n) for n in n_values])
-csv_file_average_contents=[top_line]
-csv_file_worst_contents=[top_line]
-
-print("Generating results for changing k and n")
-
-for k in k_values:
-    csv_row_worst_case = f"{k},"
-    csv_row_average_case = f"{k},"
-    for n in n_values:
-        file_name = directory_string + f"capture_k{k}_i12_Q{m}p{n}.txt"
-        print("\tLoading File From: " + file_name)
-        start = time.time()
-        worst,average = error_checker.runErrorChecker(m,n,file_name,True)
-        csv_row_average_case+=f"{average:.20f},"
-        csv_row_worst_case+=f"{worst:.20f},"
-        end = time.time()
-        print(f"\tProcessing Time: {end - start}")
-
-    csv_file_worst_contents.append(csv_row_worst_case)
-    csv_file_average_contents.append(csv_row_average_case)
-
-# 1.6 Write the extracted results to file
-with open(directory_string + 'experiment_results_k_scaling_largest_error.csv', 'w') as f:
-    for line in csv_file_worst_contents:
-        f.write(f"{line}\n")
-
-with open(directory_string + 'experiment_results_k_scaling_average_error.csv', 'w') as f:
-    for line in csv_file_average_contents:
-        f.write(f"{line}\n")
-
-# 2. Generate csv files for the second experiment
-# 2.1 Load the names of all the capture files for K=16 in the results folder
-result_files_names = [f for f in os.listdir(directory_string) if os.path.isfile(os.path.join(directory_string, f)) and "capture_k16" in f and not "_i12_" in f]
-
-# 2.2 Get the varying n and i values
-n_values_not_unique_not_sorted = [int(f[f.rfind("p")+1:f.rfind(".")]) for f in result_files_names]
-n_values = list(dict.fromkeys(n_values_not_unique_not_sorted))
-n_values.sort()
-
-i_values_not_unique_not_sorted = [int(f[f.find("_i")+2:f.find("_",f.find("_i")+2)]) for f in result_files_names]
-i_values = list(dict.fromkeys(i_values_not_unique_not_sorted))
-i_values.append(12) # We excluded this from our search as i12 is for experiment one, it would confuse our i values. But its safe to add it back now
-i_values.sort()
-
-# 2.3 Exract the error values from the different files for the first experiment and store the
-# results in a string
-top_line = "i\\n,"+",".join([str(n) for n in n_values])
-csv_file_average_contents=[top_line]
-csv_file_worst_contents=[top_line]
-
-print("Generating results for changing i and n")
-for i in i_values:
-    csv_row_worst_case = f"{i},"
-    csv_row_average_case = f"{i},"
-    for n in n_values:
-        file_name = directory_string + f"capture_k16_i{i}_Q{m}p{n}.txt"
-        start = time.time()
-        print("\tLoading File From: " + file_name)
-        worst,average = error_checker.runErrorChecker(m,n,file_name,True)
-        csv_row_average_case+=f"{average:.20f},"
-        csv_row_worst_case+=f"{worst:.20f},"
-
-    csv_file_worst_contents.append(csv_row_worst_case)
-    csv_file_average_contents.append(csv_row_average_case)
-
-# 2.3 Write the extracted results to file
-with open(directory_string + 'experiment_results_CORDIC_iters_largest_error.csv', 'w') as f:
-    for line in csv_file_worst_contents:
-        f.write(f"{line}\n")
-
-with open(directory_string + 'experiment_results_CORDIC_iters_average_error.csv', 'w') as f:
-    for line in csv_file_average_contents:
-        f.write(f"{line}\n")
+
+
+def sweep(file_name_template, axis_label, axis_values, n_values, m, output_prefix):
+    """
+    Run the error checker over one experiment grid and write the worst and
+    average error csv files for it.
+
+    Both experiments are the same sweep with a different varying axis, so they
+    share this function. The capture file name is built by formatting the
+    template with the axis value, m and n. Every (axis, n) cell is independent,
+    so the files are processed in parallel with one task per cell and the csv
+    rows are assembled from the results afterwards.
+    """
+    print(f"Generating results for changing {axis_label} and n")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor() as executor:
+        futures = {(axis_value, n): executor.submit(error_checker.runErrorChecker, m, n,
+                                                    directory_string + file_name_template.format(axis=axis_value, m=m, n=n), True)
+                   for axis_value in axis_values for n in n_values}
+        results = {cell: future.result() for cell, future in futures.items()}
+    end = time.perf_counter()
+    print(f"\tProcessing Time: {end - start}")
+
+    # Write the extracted error values to file, one csv row per axis value.
+    with open(directory_string + output_prefix + '_largest_error.csv', 'w', newline='') as worst_file, \
+         open(directory_string + output_prefix + '_average_error.csv', 'w', newline='') as average_file:
+        # The default dialect terminates rows with \r\n; keep the files LF
+        # terminated like every other generated csv in the repository.
+        worst_writer = csv.writer(worst_file, lineterminator="\n")
+        average_writer = csv.writer(average_file, lineterminator="\n")
+        worst_writer.writerow([axis_label + "\\n"] + n_values)
+        average_writer.writerow([axis_label + "\\n"] + n_values)
+        # The empty final field keeps the trailing comma every data row has
+        # always carried, so the files stay byte identical to the other
+        # generators' output.
+        for axis_value in axis_values:
+            worst_writer.writerow([axis_value] + [f"{results[(axis_value, n)][0]:.20f}" for n in n_values] + [""])
+            average_writer.writerow([axis_value] + [f"{results[(axis_value, n)][1]:.20f}" for n in n_values] + [""])
+
+
+# The ProcessPoolExecutor workers re-import this module under the spawn and
+# forkserver start methods, so the sweeps must only run in the main process.
+if(__name__ == "__main__"):
+    # 1. Generate csv files for the first experiment
+    # 1.1 Load the names of all the capture files in the results folder where the number of cordic iterations is 12
+    # os.scandir serves the is_file() check from the directory read itself instead
+    # of one stat() call per entry.
+    # Only the text captures name the experiments; the .npy files written next
+    # to them by convert_captures.py must not end up in the parameter parsing.
+    with os.scandir(directory_string) as it:
+        result_files_names = [entry.name for entry in it if entry.is_file() and entry.name.endswith(".txt") and "capture_k" in entry.name and "i12" in entry.name]
+
+    # 1.2 Get a list of all unique matrix sizes "K" from the list of experiments.
+    k_values = sorted({int(f[f.find("_")+2:f.find("_",f.find("_")+2)]) for f in result_files_names})
+
+    # 1.3 Get a list of all unique fractional components "K" from the list of experiments.
+    n_values = sorted({int(f[f.rfind("p")+1:f.rfind(".")]) for f in result_files_names})
+
+    # 1.4 Get the m value. Should be the same across files
+    m = int(result_files_names[0][result_files_names[0].rfind("Q")+1:result_files_names[0].rfind("p")])
+
+    # 1.5 Extract the error values from the k/n grid and write the csv files
+    sweep("capture_k{axis}_i12_Q{m}p{n}.txt", "k", k_values, n_values, m, "experiment_results_k_scaling")
+
+    # 2. Generate csv files for the second experiment
+    # 2.1 Load the names of all the capture files for K=16 in the results folder
+    with os.scandir(directory_string) as it:
+        result_files_names = [entry.name for entry in it if entry.is_file() and entry.name.endswith(".txt") and "capture_k16" in entry.name and not "_i12_" in entry.name]
+
+    # 2.2 Get the varying n and i values
+    n_values = sorted({int(f[f.rfind("p")+1:f.rfind(".")]) for f in result_files_names})
+
+    i_values = {int(f[f.find("_i")+2:f.find("_",f.find("_i")+2)]) for f in result_files_names}
+    i_values.add(12) # We excluded this from our search as i12 is for experiment one, it would confuse our i values. But its safe to add it back now
+    i_values = sorted(i_values)
+
+    # 2.3 Extract the error values from the i/n grid and write the csv files
+    sweep("capture_k16_i{axis}_Q{m}p{n}.txt", "i", i_values, n_values, m, "experiment_results_CORDIC_iters")
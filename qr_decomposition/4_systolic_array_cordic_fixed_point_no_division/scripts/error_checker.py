@@ -8,12 +8,103 @@ for the A,Q and R matrices and interprets them as real values. It then
 multiplies Q and R together to calculate A again. From this it determines
 the error between the original A and the recalculated A.
 """
+import functools
+import mmap
+import os
+import re
 import numpy as np
-import pandas as pd
 import argparse
-import itertools
 from typing import Tuple
 
+# Numba is optional. When it is available the near-zero clamp and error
+# reductions run as a single fused compiled kernel instead of a chain of
+# numpy operations that each make a pass over the full batch.
+try:
+   from numba import njit, prange
+except ImportError:
+   njit = None
+
+# Matches a single row of a captured matrix, e.g. "A3: row 0: 12 -34 5 ".
+# Group 1 is the matrix name (A, Q or R), group 2 the decomposition index
+# and group 3 the row of integer elements.
+capture_line_pattern = re.compile(rb"^([AQR])(\d+):\s*row\s*\d+:\s*(.*?)\s*$", re.MULTILINE)
+
+if njit is not None:
+   @njit(parallel=True, fastmath=True, cache=True)
+   def _clamped_error_reduction(A, A_reconstructed):
+      """
+      Fused near-zero clamp plus max/RMS error reduction over a batch of
+      matrices. Computes, per decomposition, the same values as the numpy
+      fallback in runErrorChecker but in a single pass with no temporaries.
+      """
+      num_arrays, rows, cols = A.shape
+      highest_errors = np.empty(num_arrays, dtype=np.float64)
+      mean_errors = np.empty(num_arrays, dtype=np.float64)
+      for b in prange(num_arrays):
+         magnitude = 0.0
+         for r in range(rows):
+            for c in range(cols):
+               magnitude += abs(A_reconstructed[b, r, c])
+         near0 = magnitude / (rows * cols) / 10
+
+         highest = 0.0
+         square_sum = 0.0
+         for r in range(rows):
+            for c in range(cols):
+               reconstructed = A_reconstructed[b, r, c]
+               if abs(reconstructed) < near0:
+                  reconstructed = near0
+               original = A[b, r, c]
+               if abs(original) < near0:
+                  original = near0
+               error = abs(original - reconstructed)
+               if error > highest:
+                  highest = error
+               square_sum += error * error
+         highest_errors[b] = highest
+         mean_errors[b] = np.sqrt(square_sum / (rows * cols))
+      return highest_errors, mean_errors
+
+
+@functools.lru_cache(maxsize=1)
+def _parse_capture(input_file_name: str):
+   """
+   Read a capture file and group the row tokens of each matrix by its "X<i>:"
+   prefix in a single pass over the file.
+
+   The result only depends on the file itself, not on the fixed point format,
+   so back to back calls on the same capture reuse the parse. The cache is
+   capped at one entry: the csv sweeps read a different file per grid cell
+   because n is baked into the file name, and an unbounded cache would pin
+   every parsed capture in worker memory for the life of the pool.
+
+   :param input_file_name:str name of the capture file to parse.
+   :return: (int, dict). The number of captured decompositions and a dict
+            mapping each tag (e.g. "A3") to its list of row token lists.
+   """
+   # Group the row tokens of each matrix by its "X<i>:" prefix in a single
+   # pass over the file. The file is memory mapped and scanned in place with
+   # the bytes pattern, so no Python string object is built per line; one
+   # finditer sweep extracts the matrix name, decomposition index and row
+   # payload of every line in the regex engine instead of several
+   # find()/rfind() scans per line. The actor network can perform QR
+   # decomposition many times, the number of decompositions falls out of the
+   # highest index seen.
+   tag_lines = {}
+   num_arrays = 0
+   with open(input_file_name, 'rb') as file:
+      # A zero length capture cannot be memory mapped and has nothing to scan.
+      if os.fstat(file.fileno()).st_size == 0:
+         return num_arrays, tag_lines
+      with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+         for match in capture_line_pattern.finditer(buffer):
+            index = int(match.group(2))
+            if index >= num_arrays:
+               num_arrays = index + 1
+            tag_lines.setdefault((match.group(1) + match.group(2)).decode(), []).append(match.group(3).split())
+
+   return num_arrays, tag_lines
+
 
 def runErrorChecker(m: int = 3, n:int = 19, input_file_name:str="accuracy_results/capture_k4_Q3p19.txt", suppress:bool=False) -> Tuple[float,float]:
    """
@@ -30,108 +121,88 @@ def runErrorChecker(m: int = 3, n:int = 19, input_file_name:str="accuracy_result
    :return:(float, float). A tuple containing first, the worst error value among all the arrays
                            and second, the RMS error value among the arrays.
    """
-   # 1. Read data from file
-   with open(input_file_name, 'r') as file:
-      content = file.readlines()
-
-
-   # The actor network can perform QR decomposition many times. We need to verify
-   # that each of these produces relatively small errors
-   lrow=content[-1]
-   num_arrays = int(lrow[1:lrow.find(":")]) + 1
-   array_dimension=int(lrow[lrow.find("row ")+4][0:lrow.find(":")])
-   highest_errors = []
-   mean_errors = []
-
-   for i in range(0,num_arrays):
-
-      # 2. Get the A,Q and R matrices from the read data, convert them from integers
-      # to floating point numpy arrays.
-         
-      # This function in conjunction with itertools.takewhile stops searching the array
-      # when we reach the matrix past this one. This prevents unecessary searching.
-      def isLast(mat,line):
-         if(line.find(mat) == 0):
-            #print(line)
-            if(int(line[line.find("row ")+4][0:line.find(":")]) == array_dimension):
-               #print("Done")
-               return False
-         return True
-      
-      # 2.1 Get A matrix
-      A_matrix_string = [x for x in itertools.takewhile(lambda line: isLast(f"A{i+1}",line), content) if x[0:x.find(":")] == f"A{i}"]
-      #A_matrix_string = [x for x in content if x[0:x.find(":")] == f"A{i}"]
-      A_matrix_fp = [[int(x)*(2**-n) for x in line[line.rfind(":")+2:-2].split()] for line in A_matrix_string]
-      A_matrix_fp_np = np.array(A_matrix_fp)
-
-      # 2.2 Get the R matrix
-      R_matrix_string = [x for x in itertools.takewhile(lambda line: isLast(f"R{i+1}",line), content) if x[0:x.find(":")] == f"R{i}"]
-      #R_matrix_string = [x for x in content if x[0:x.find(":")] == f"R{i}"]
-      R_matrix_fp = [[int(x)*(2**-n) for x in line[line.rfind(":")+2:-2].split()] for line in R_matrix_string]
-      R_matrix_fp_np = np.array(R_matrix_fp)
-
-      # 2.3 Get the Q matrix
-      Q_matrix_string = [x for x in itertools.takewhile(lambda line: isLast(f"Q{i+1}",line), content) if x[0:x.find(":")] == f"Q{i}"]
-      #Q_matrix_string = [x for x in content if x[0:x.find(":")] == f"Q{i}"]
-      Q_matrix_fp = [[int(x)*(2**-n) for x in line[line.rfind(":")+2:-2].split()] for line in Q_matrix_string]
-      Q_matrix_fp_np = np.array(Q_matrix_fp)
-
-      # 2.4 Remove the extracted elements from R to reduce the size of the next search
-      # Searching from the front as the elements are mostly in order.
-      for x in A_matrix_string:
-         content.remove(x)
-      for x in Q_matrix_string:
-         content.remove(x)
-      for x in R_matrix_string:
-         content.remove(x)
-
-      # 3. Multiply the Q and R matrix together to reconstruct the A matrix
-      A_reconstructed = np.matmul(Q_matrix_fp_np, R_matrix_fp_np)
-
-      near0 = np.mean(np.abs(A_reconstructed))/10
-      A_reconstructed[np.abs(A_reconstructed) < near0] = near0
-      A_matrix_fp_np[np.abs(A_matrix_fp_np) < near0] = near0
-
-      # 4. Determine the error between the source A matrix and the reconstructed one
-      # Determine the error between the different elements
-      errors = np.abs(A_matrix_fp_np - A_reconstructed)
-      highest_error= np.max(errors)
-      mean_error= np.sqrt(np.mean(np.square(errors)))
-
-      # 5. Print all arrays and errors. Only print the highest error value if the
-      # suppress flag is set
-      if(not suppress):
+   # pandas is only used to pretty print the matrices, so the csv batch path
+   # (which always suppresses the printing) never pays its import cost.
+   if(not suppress):
+      import pandas as pd
+
+   # 1. Read the grouped matrix rows from the file (cached across calls with
+   # the same file). We need to verify that each of the captured decompositions
+   # produces relatively small errors.
+   num_arrays, tag_lines = _parse_capture(input_file_name)
+   scale = 2.0 ** -n
+
+   if(num_arrays == 0):
+      return 0.0, 0.0
+
+   # 2. Get the A,Q and R matrices from the grouped rows, convert them from
+   # integers to floating point numpy arrays. numpy's C tokeniser converts
+   # the row tokens straight into an int64 array, so no Python int or float
+   # objects are created per matrix element, and the 2^-n interpretation is
+   # one vector multiply. The matrices are stacked along the first axis with
+   # one slice per decomposition.
+   A_matrices_fp = np.stack([np.array(tag_lines.get(f"A{i}", []), dtype=np.int64) for i in range(0,num_arrays)]) * scale
+   Q_matrices_fp = np.stack([np.array(tag_lines.get(f"Q{i}", []), dtype=np.int64) for i in range(0,num_arrays)]) * scale
+   R_matrices_fp = np.stack([np.array(tag_lines.get(f"R{i}", []), dtype=np.int64) for i in range(0,num_arrays)]) * scale
+
+   # 3. Multiply the Q and R matrices together to reconstruct the A matrices.
+   # A single batched matmul over all decompositions amortises the per-call
+   # numpy dispatch overhead of num_arrays small matrix multiplies.
+   A_reconstructed = np.matmul(Q_matrices_fp, R_matrices_fp)
+
+   # 4. Determine the error between the source A matrices and the reconstructed
+   # ones. With numba available (and no per-matrix printing needed) the clamp
+   # and reductions run as one fused kernel without materialising any
+   # batch-sized temporaries.
+   if njit is not None and suppress:
+      highest_errors, mean_errors = _clamped_error_reduction(A_matrices_fp, A_reconstructed)
+      return np.max(highest_errors),np.mean(mean_errors)
+
+   near0 = np.mean(np.abs(A_reconstructed), axis=(1,2), keepdims=True)/10
+   A_reconstructed = np.where(np.abs(A_reconstructed) < near0, near0, A_reconstructed)
+   A_matrices_fp = np.where(np.abs(A_matrices_fp) < near0, near0, A_matrices_fp)
+
+   # Determine the error between the different elements. Forwarding one buffer
+   # through the subtract and abs ufuncs with out= avoids allocating a fresh
+   # batch-sized temporary per operation.
+   errors = np.empty_like(A_reconstructed)
+   np.subtract(A_matrices_fp, A_reconstructed, out=errors)
+   np.abs(errors, out=errors)
+   highest_errors = np.max(errors, axis=(1,2))
+   mean_errors = np.sqrt(np.mean(np.square(errors), axis=(1,2)))
+
+   # 5. Print all arrays and errors. Only print the highest error value if the
+   # suppress flag is set
+   if(not suppress):
+      for i in range(0,num_arrays):
          print(f"R{i} matrix:")
-         print(pd.DataFrame(R_matrix_fp_np))
+         print(pd.DataFrame(R_matrices_fp[i]))
          print()
 
          print(f"Q{i} matrix: ")
-         print(pd.DataFrame(Q_matrix_fp_np))
+         print(pd.DataFrame(Q_matrices_fp[i]))
          print()
 
          print(f"Original A{i} matrix: ")
-         print(pd.DataFrame(A_matrix_fp_np))
+         print(pd.DataFrame(A_matrices_fp[i]))
          print()
 
          print(f"A{i} matrix constructed by multiplying Q{i} and R{i}: ")
-         print(pd.DataFrame(A_reconstructed))
+         print(pd.DataFrame(A_reconstructed[i]))
          print()
 
          print(f"Error between elements of original A{i} and reconstructed A{i} |a1_ij-a2_ij|")
-         print(pd.DataFrame(errors))
+         print(pd.DataFrame(errors[i]))
          print()
 
          print("Highest error (1 is maximum):")
-         print(highest_error)
+         print(highest_errors[i])
          print()
 
          print("RMS error (1 is maximum):")
-         print(mean_error)
+         print(mean_errors[i])
          print()
 
-      highest_errors.append(highest_error)
-      mean_errors.append(mean_error)
-
    if(not suppress):
       print("Maximum error across all input arrays/Mean error across all input arrays (maximum is 1):")
       print(np.max(highest_errors),np.mean(mean_errors))
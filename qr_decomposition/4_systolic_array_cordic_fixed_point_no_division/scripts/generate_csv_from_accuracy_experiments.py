@@ -15,103 +15,115 @@ This results in 4 csv files, 2 for each experiment.
 """
 
 import error_checker
+import numpy as np
 import os
+import re
 import time
-
-# 1. Generate csv files for the first experiment
-# 1.1 Load the names of all the capture files in the results folder where the number of cordic iterations is 16
-directory_string = "accuracy_results/"
-result_files_names = [f for f in os.listdir(directory_string) if os.path.isfile(os.path.join(directory_string, f)) and "capture_k" in f and "i16" in f]
-
-# 1.2 Get a list of all unique matrix sizes "K" from the list of experiments.
-k_values_not_unique_not_sorted = [int(f[f.find("_")+2:f.find("_",f.find("_")+2)]) for f in result_files_names]
-k_values = list(dict.fromkeys(k_values_not_unique_not_sorted))
-k_values.sort()
-
-# 1.3 Get a list of all unique fractional components "K" from the list of experiments.
-n_values_not_unique_not_sorted = [int(f[f.rfind("p")+1:f.rfind(".")]) for f in result_files_names]
-n_values = list(dict.fromkeys(n_values_not_unique_not_sorted))
-n_values.sort()
-
-# 1.4 Get the m value. Should be the same across files
-m_values_not_unique_not_sorted = [int(f[f.rfind("Q")+1:f.rfind("p")]) for f in result_files_names]
-m = m_values_not_unique_not_sorted[0]
-
-# 1.5 Exract the error values from the different files for the first experiment and store the
-# results in a string
-top_line = "k\\n,"+",".join([str(n) for n in n_values])
-csv_file_average_contents=[top_line]
-csv_file_worst_contents=[top_line]
-
-print("Generating results for changing k and n")
-
-for k in k_values:
-    csv_row_worst_case = f"{k},"
-    csv_row_average_case = f"{k},"
-    for n in n_values:
-        file_name = directory_string + f"capture_k{k}_i16_Q{m}p{n}.txt"
-        print("\tLoading File From: " + file_name)
-        start = time.time()
-        worst,average = error_checker.runErrorChecker(m,n,file_name,True)
-        csv_row_average_case+=f"{average:.20f},"
-        csv_row_worst_case+=f"{worst:.20f},"
-        end = time.time()
-        print(f"\tProcessing Time: {end - start}. Accuracy Worst: {worst}, Average: {average}")
-
-    csv_file_worst_contents.append(csv_row_worst_case)
-    csv_file_average_contents.append(csv_row_average_case)
-
-# 1.6 Write the extracted results to file
-with open(directory_string + 'experiment_results_k_scaling_largest_error.csv', 'w') as f:
-    for line in csv_file_worst_contents:
-        f.write(f"{line}\n")
-
-with open(directory_string + 'experiment_results_k_scaling_average_error.csv', 'w') as f:
-    for line in csv_file_average_contents:
-        f.write(f"{line}\n")
-
-# 2. Generate csv files for the second experiment
-# 2.1 Load the names of all the capture files for K=16 in the results folder
-result_files_names = [f for f in os.listdir(directory_string) if os.path.isfile(os.path.join(directory_string, f)) and "capture_k16" in f and not "_i16_" in f]
-
-# 2.2 Get the varying n and i values
-n_values_not_unique_not_sorted = [int(f[f.rfind("p")+1:f.rfind(".")]) for f in result_files_names]
-n_values = list(dict.fromkeys(n_values_not_unique_not_sorted))
-n_values.sort()
-
-i_values_not_unique_not_sorted = [int(f[f.find("_i")+2:f.find("_",f.find("_i")+2)]) for f in result_files_names]
-i_values = list(dict.fromkeys(i_values_not_unique_not_sorted))
-i_values.append(16) # We excluded this from our search as i16 is for experiment one, it would confuse our i values. But its safe to add it back now
-i_values.sort()
-
-# 2.3 Exract the error values from the different files for the first experiment and store the
-# results in a string
-top_line = "i\\n,"+",".join([str(n) for n in n_values])
-csv_file_average_contents=[top_line]
-csv_file_worst_contents=[top_line]
-
-print("Generating results for changing i and n")
-for i in i_values:
-    csv_row_worst_case = f"{i},"
-    csv_row_average_case = f"{i},"
-    for n in n_values:
-        file_name = directory_string + f"capture_k16_i{i}_Q{m}p{n}.txt"
-        start = time.time()
-        print("\tLoading File From: " + file_name)
-        worst,average = error_checker.runErrorChecker(m,n,file_name,True)
-        csv_row_average_case+=f"{average:.20f},"
-        csv_row_worst_case+=f"{worst:.20f},"
-        end = time.time()
-        print(f"\tProcessing Time: {end - start}. Accuracy Worst: {worst}, Average: {average}")
-
-    csv_file_worst_contents.append(csv_row_worst_case)
-    csv_file_average_contents.append(csv_row_average_case)
-
-# 2.3 Write the extracted results to file
-with open(directory_string + 'experiment_results_CORDIC_iters_largest_error.csv', 'w') as f:
-    for line in csv_file_worst_contents:
-        f.write(f"{line}\n")
-
-with open(directory_string + 'experiment_results_CORDIC_iters_average_error.csv', 'w') as f:
-    for line in csv_file_average_contents:
-        f.write(f"{line}\n")
+from concurrent.futures import ProcessPoolExecutor
+
+# Matches the capture file names produced by the experiment runs. Each field is
+# parsed once with a single match instead of a chain of find()/rfind() scans
+# per field.
+capture_name_pattern = re.compile(r"capture_k(?P<k>\d+)_i(?P<i>\d+)_Q(?P<m>\d+)p(?P<n>\d+)\.txt")
+
+# The ProcessPoolExecutor workers re-import this module under the spawn and
+# forkserver start methods, so the sweeps must only run in the main process.
+if(__name__ == "__main__"):
+    # 1. Generate csv files for the first experiment
+    # 1.1 Load the names of all the capture files in the results folder where the number of cordic iterations is 16
+    directory_string = "accuracy_results/"
+    # os.scandir serves the is_file() check from the directory read itself instead
+    # of one stat() call per entry.
+    with os.scandir(directory_string) as it:
+        result_files_names = [entry.name for entry in it if entry.is_file() and "capture_k" in entry.name and "i16" in entry.name]
+
+    # 1.2 Parse each file name once with the capture name pattern.
+    metadata = [capture_name_pattern.match(f).groupdict() for f in result_files_names]
+
+    # 1.3 Get the unique sorted matrix sizes "k" and fractional components "n"
+    # from the parsed fields.
+    k_values = sorted({int(meta["k"]) for meta in metadata})
+    n_values = sorted({int(meta["n"]) for meta in metadata})
+
+    # 1.4 Get the m value. Should be the same across files
+    m = int(metadata[0]["m"])
+
+    # 1.5 Exract the error values from the different files for the first experiment and store the
+    # results in a grid
+    top_line = "k\\n,"+",".join([str(n) for n in n_values])
+
+    # One row per axis value: the axis value itself followed by the error value of
+    # every n. The last column's format carries the trailing comma of each row.
+    row_format = ["%d"] + ["%.20f"] * (len(n_values) - 1) + ["%.20f,"]
+
+    print("Generating results for changing k and n")
+
+    # Every (k,n) cell is independent, so the files are processed in parallel with
+    # one task per cell and the csv rows are assembled from the results afterwards.
+    start = time.perf_counter()
+    with ProcessPoolExecutor() as executor:
+        futures = {(k, n): executor.submit(error_checker.runErrorChecker, m, n, directory_string + f"capture_k{k}_i16_Q{m}p{n}.txt", True)
+                   for k in k_values for n in n_values}
+        results = {cell: future.result() for cell, future in futures.items()}
+    end = time.perf_counter()
+    print(f"\tProcessing Time: {end - start}")
+
+    # The error values are gathered into one numpy grid per statistic and each
+    # grid is written with a single np.savetxt call, whose C level float formatter
+    # replaces the per-cell f-string formatting.
+    worst_grid = np.empty((len(k_values), len(n_values) + 1))
+    average_grid = np.empty_like(worst_grid)
+    worst_grid[:, 0] = k_values
+    average_grid[:, 0] = k_values
+    for ki, k in enumerate(k_values):
+        for ni, n in enumerate(n_values):
+            worst_grid[ki, ni + 1], average_grid[ki, ni + 1] = results[(k, n)]
+
+    # 1.6 Write the extracted results to file
+    np.savetxt(directory_string + 'experiment_results_k_scaling_largest_error.csv', worst_grid,
+               delimiter=',', fmt=row_format, header=top_line, comments='')
+    np.savetxt(directory_string + 'experiment_results_k_scaling_average_error.csv', average_grid,
+               delimiter=',', fmt=row_format, header=top_line, comments='')
+
+    # 2. Generate csv files for the second experiment
+    # 2.1 Load the names of all the capture files for K=16 in the results folder
+    with os.scandir(directory_string) as it:
+        result_files_names = [entry.name for entry in it if entry.is_file() and "capture_k16" in entry.name and not "_i16_" in entry.name]
+
+    # 2.2 Get the varying n and i values
+    metadata = [capture_name_pattern.match(f).groupdict() for f in result_files_names]
+
+    n_values = sorted({int(meta["n"]) for meta in metadata})
+
+    i_values = {int(meta["i"]) for meta in metadata}
+    i_values.add(16) # We excluded this from our search as i16 is for experiment one, it would confuse our i values. But its safe to add it back now
+    i_values = sorted(i_values)
+
+    # 2.3 Exract the error values from the different files for the first experiment and store the
+    # results in a grid
+    top_line = "i\\n,"+",".join([str(n) for n in n_values])
+    row_format = ["%d"] + ["%.20f"] * (len(n_values) - 1) + ["%.20f,"]
+
+    print("Generating results for changing i and n")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor() as executor:
+        futures = {(i, n): executor.submit(error_checker.runErrorChecker, m, n, directory_string + f"capture_k16_i{i}_Q{m}p{n}.txt", True)
+                   for i in i_values for n in n_values}
+        results = {cell: future.result() for cell, future in futures.items()}
+    end = time.perf_counter()
+    print(f"\tProcessing Time: {end - start}")
+
+    worst_grid = np.empty((len(i_values), len(n_values) + 1))
+    average_grid = np.empty_like(worst_grid)
+    worst_grid[:, 0] = i_values
+    average_grid[:, 0] = i_values
+    for ii, i in enumerate(i_values):
+        for ni, n in enumerate(n_values):
+            worst_grid[ii, ni + 1], average_grid[ii, ni + 1] = results[(i, n)]
+
+    # 2.3 Write the extracted results to file
+    np.savetxt(directory_string + 'experiment_results_CORDIC_iters_largest_error.csv', worst_grid,
+               delimiter=',', fmt=row_format, header=top_line, comments='')
+    np.savetxt(directory_string + 'experiment_results_CORDIC_iters_average_error.csv', average_grid,
+               delimiter=',', fmt=row_format, header=top_line, comments='')
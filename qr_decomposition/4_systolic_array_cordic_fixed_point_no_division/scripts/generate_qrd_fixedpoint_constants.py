@@ -4,6 +4,7 @@
 # NOTE: This overwrites qrd_systolic_cordic_fixedpoint.cal
 
 
+import math
 import argparse
 parser = argparse.ArgumentParser(
                     prog='Fixed Point CAL Code Generator',
@@ -19,24 +20,28 @@ m = args.fixed_point_m
 n = args.fixed_point_n
 
 fp_one = 1 << n
-fp_minus_one = -fp_one 
+fp_minus_one = -fp_one
+
+# 2^n and 2^-n are the same for every constant, compute them once and reuse
+# them instead of repeating the exponentiations per constant.
+fp_scale_inv = math.ldexp(1.0, -n)
 
 k = 0.607252956441381
-k_fp = int(k * (2 ** n))
-k_actual = k_fp * (2.0 ** -n)
+k_fp = int(k * fp_one)
+k_actual = k_fp * fp_scale_inv
 
 
 increment = 0.11
-increment_fp = int(increment * (2 ** n))
-increment_actual = increment_fp * (2.0 ** -n)
+increment_fp = int(increment * fp_one)
+increment_actual = increment_fp * fp_scale_inv
 
 lowerBoundary_P = 0.00005
-lowerBoundary_P_fp = int(lowerBoundary_P * (2 ** n))
-lowerBoundary_P_actual = lowerBoundary_P_fp * (2.0 ** -n)
+lowerBoundary_P_fp = int(lowerBoundary_P * fp_one)
+lowerBoundary_P_actual = lowerBoundary_P_fp * fp_scale_inv
 
 lowerBoundary_N = -0.00005
-lowerBoundary_N_fp = int(lowerBoundary_N * (2 ** n))
-lowerBoundary_N_actual = lowerBoundary_N_fp * (2.0 ** -n)
+lowerBoundary_N_fp = int(lowerBoundary_N * fp_one)
+lowerBoundary_N_actual = lowerBoundary_N_fp * fp_scale_inv
 
 output=f"""    // ==== Fixed Point Constants: Start ===
 
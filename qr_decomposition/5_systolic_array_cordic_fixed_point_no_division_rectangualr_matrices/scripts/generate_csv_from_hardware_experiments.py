@@ -1,4 +1,5 @@
 import os
+import re
 """
 This is a very rough script. Every Vivado project in the fpga_scaling_experiments and 
 fpga_param_experiments directory contains a utilisation and timing report. This script
@@ -17,10 +18,41 @@ Additionally, the csv per build for the scaling experiments can be found in
     - fpga_param_experiments/reports/<project_name>_utilisation.csv
 """
 
+# Matches the report file names produced by the build scripts, the inverse of
+# generateFilePrefix below. Each field is parsed once with a single match
+# instead of a chain of find()/rfind() scans per field.
+report_name_pattern = re.compile(r"build_M(?P<M>\d+)_N(?P<N>\d+)_Q(?P<m>\d+)p(?P<n>\d+)_i(?P<i>\d+)_(?P<fpga>Zync[^_]+)_clk(?P<clk>[^_]+)_unroll(?P<unroll>[^_]+)_utilisation\.rpt")
+
+def unrollNameToFactor(unrollName):
+    return 1 if unrollName == "None" else 1000 if unrollName == "All" else int(unrollName)
+
+def parseUtilisationTable(filePath_util):
+    """Stream the rows of the "1. Utilization by Hierarchy" table of a Vivado
+    utilisation report. Yields the stripped cells of the headings row followed
+    by the cells of every top level instance row. Only one line is held in
+    memory at a time, so large reports are not read in whole."""
+    with open(filePath_util, 'r') as file:
+        # Skip ahead to the section header
+        for line in file:
+            if line.startswith("1. Utilization by Hierarchy"):
+                break
+        # Skip the banner between the section header and the headings row
+        for _ in range(5):
+            next(file)
+        yield [entry.strip() for entry in next(file)[1:-2].split("|")]
+        for line in file:
+            if line[0] == "+":
+                continue # separator row inside the table
+            if line[0] != "|":
+                break # end of the table
+            if line.find("|    ") == 0:
+                continue # instance nested below the depth being reported on
+            yield [entry.strip() for entry in line[1:-2].split("|")]
+
 def generateFilePrefix(fpga_part, clock_period, loop_unroll_factor, m, n, M,N, i):
     clock=str(clock_period).replace(".","p")
     unrollName = "None" if loop_unroll_factor == 1 else "All" if loop_unroll_factor == 1000 else loop_unroll_factor
-    filePrefix = f"build_M{k}_N{k}_Q{m}p{n}_i{i}_{fpga_part}_clk{clock}_unroll{unrollName}"
+    filePrefix = f"build_M{M}_N{N}_Q{m}p{n}_i{i}_{fpga_part}_clk{clock}_unroll{unrollName}"
     return filePrefix
 
 def processUtilisationReport(fpga_part, clock_period, loop_unroll_factor, m, n, M,N, i, directory_string):
@@ -28,21 +60,13 @@ def processUtilisationReport(fpga_part, clock_period, loop_unroll_factor, m, n,
     filePath_util = f"{directory_string}/{filePrefix}_utilisation.rpt"
     filePath_timing = f"{directory_string}/{filePrefix}_timing.rpt"
   
-    with open(filePath_util, 'r') as file:
-        content = file.readlines()
-
-    timing_violations=False
+    # find() returns -1 when the marker is absent, which is truthy, so the
+    # presence check must use the in operator.
     with open(filePath_timing, 'r') as file:
-        contents = file.read()
-        if(contents.find("VIOLATED")):
-            timing_violations=True
-        
-        
-    start_index = content.index('1. Utilization by Hierarchy\n') + 6
-    headings=[entry.strip() for entry in content[start_index][1:-2].split("|")]
-    
-    resource_table=content[start_index:-1]
-    resource_table = [line for line in resource_table if line.find("|    ") != 0 and line[0] != "+"]
+        timing_violations = "VIOLATED" in file.read()
+
+    table_rows = parseUtilisationTable(filePath_util)
+    headings = next(table_rows)
 
 
     top=""
@@ -56,9 +80,7 @@ def processUtilisationReport(fpga_part, clock_period, loop_unroll_factor, m, n,
     with open(f"{directory_string}/{filePrefix}_utilisation.csv", 'w') as output_file:
         output_file.write(",".join(headings) + "\n")
 
-        for line in resource_table:
-            split_line_with_whitespace = line[1:-2].split("|")
-            split_line = [entry.strip() for  entry in split_line_with_whitespace]
+        for split_line in table_rows:
             output_line= ",".join(split_line)
             output_file.write(output_line + "\n")
 
@@ -86,30 +108,25 @@ def collectParamExperimentResults():
     # 1. Generate csv files for the first experiment
     # 1.1 Load the names of all the capture files in the results folder where the number of cordic iterations is 16
     directory_string = "fpga_param_experiments/reports"
-    result_files_names = [f for f in os.listdir(directory_string) if os.path.isfile(os.path.join(directory_string, f)) and "_utilisation.rpt" in f]
-
-    fpga_parts_not_sorted = [f[f.find("Zync"):f.find("_",f.find("Zync"))] for f in result_files_names]
-    fpga_parts = list(dict.fromkeys(fpga_parts_not_sorted))
-    fpga_parts.sort()
-
-    clock_periods_not_sorted = [f[f.find("clk")+3:f.find("_",f.find("clk"))] for f in result_files_names]
-    clock_periods = list(dict.fromkeys(clock_periods_not_sorted))
-    clock_periods = [float(f.replace("p",".")) for f in clock_periods]
-    clock_periods.sort()
-
-    loop_unroll_factors_not_sorted = [f[f.find("unroll")+6:f.find("_",f.find("unroll"))] for f in result_files_names]
-    loop_unroll_factors = list(dict.fromkeys(loop_unroll_factors_not_sorted))
-    loop_unroll_factors = ["1" if x == "None" else x for x in loop_unroll_factors]
-    loop_unroll_factors = ["1000" if x == "All" else x for x in loop_unroll_factors]
-    loop_unroll_factors = [int(x) for x in loop_unroll_factors]
-    loop_unroll_factors.sort()
-
-    f = result_files_names[0]
-    M = int(f[f.find("M")+1:f.find("_",f.find("M"))])
-    N = int(f[f.find("N")+1:f.find("_",f.find("N"))])
-    m = int(f[f.find("_Q")+2:f.find("p",f.find("_Q"))])
-    i = int(f[f.find("_i")+2:f.find("_",f.find("_i")+2)])
-    n = int(f[f.find("p",f.find("_Q"))+1:f.find("_", f.find("p",f.find("_Q")))])
+    # os.scandir serves the is_file() check from the directory read itself
+    # instead of one stat() call per entry.
+    with os.scandir(directory_string) as it:
+        result_files_names = [entry.name for entry in it if entry.is_file() and "_utilisation.rpt" in entry.name]
+
+    # 1.2 Parse each file name once with the report name pattern and derive the
+    # unique sorted experiment parameters from the matched fields.
+    metadata = [report_name_pattern.match(f).groupdict() for f in result_files_names]
+
+    fpga_parts = sorted({meta["fpga"] for meta in metadata})
+    clock_periods = sorted({float(meta["clk"].replace("p",".")) for meta in metadata})
+    loop_unroll_factors = sorted({unrollNameToFactor(meta["unroll"]) for meta in metadata})
+
+    # These values should be the same across files
+    M = int(metadata[0]["M"])
+    N = int(metadata[0]["N"])
+    m = int(metadata[0]["m"])
+    i = int(metadata[0]["i"])
+    n = int(metadata[0]["n"])
 
     top_results=[]
     timing_violations_results=[]
@@ -181,22 +198,23 @@ def collectScalingExperimentResults():
     # 1. Generate csv files for the first experiment
     # 1.1 Load the names of all the capture files in the results folder where the number of cordic iterations is 16
     directory_string = "fpga_scaling_experiments/reports"
-    result_files_names = [f for f in os.listdir(directory_string) if os.path.isfile(os.path.join(directory_string, f)) and "_utilisation.rpt" in f]
-
-    M_values_not_unique_not_sorted = [int(f[f.find("_")+2:f.find("_",f.find("_")+2)]) for f in result_files_names]
-    M_values = list(dict.fromkeys(M_values_not_unique_not_sorted))
-    M_values.sort()
-
-    f = result_files_names[0]
-    m = int(f[f.find("_Q")+2:f.find("p",f.find("_Q"))])
-    i = int(f[f.find("_i")+2:f.find("_",f.find("_i")+2)])
-    n = int(f[f.find("p",f.find("_Q"))+1:f.find("_", f.find("p",f.find("_Q")))])
-    loop_unroll_factor = f[f.find("unroll")+6:f.find("_",f.find("unroll"))]
-    loop_unroll_factor = "1" if loop_unroll_factor == "None" else loop_unroll_factor
-    loop_unroll_factor = "1000" if loop_unroll_factor == "All" else loop_unroll_factor
-    loop_unroll_factor = int(loop_unroll_factor)
-    clock_period = float(f[f.find("clk")+3:f.find("_",f.find("clk"))].replace("p","."))
-    fpga_part = f[f.find("Zync"):f.find("_",f.find("Zync"))]
+    # os.scandir serves the is_file() check from the directory read itself
+    # instead of one stat() call per entry.
+    with os.scandir(directory_string) as it:
+        result_files_names = [entry.name for entry in it if entry.is_file() and "_utilisation.rpt" in entry.name]
+
+    # 1.2 Parse each file name once with the report name pattern. Only M and N
+    # vary in this experiment, the remaining parameters are the same across files.
+    metadata = [report_name_pattern.match(f).groupdict() for f in result_files_names]
+
+    M_values = sorted({int(meta["M"]) for meta in metadata})
+
+    m = int(metadata[0]["m"])
+    i = int(metadata[0]["i"])
+    n = int(metadata[0]["n"])
+    loop_unroll_factor = unrollNameToFactor(metadata[0]["unroll"])
+    clock_period = float(metadata[0]["clk"].replace("p","."))
+    fpga_part = metadata[0]["fpga"]
     
     top_results=[]
     timing_violations_results=[]